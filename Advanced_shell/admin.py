@@ -1,8 +1,40 @@
 # pokemon_api/admin.py
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connection
+from django.utils.functional import cached_property
 from .models import Pokemon, APIRequest
 
 
+def is_changelist(request):
+    """True for changelist pages, where only list_display columns are shown"""
+    match = request.resolver_match
+    return bool(match and match.url_name and match.url_name.endswith('_changelist'))
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator using the planner's row estimate for large unfiltered tables"""
+    
+    EXACT_COUNT_THRESHOLD = 1000
+    
+    @cached_property
+    def count(self):
+        query = self.object_list.query
+        if query.where:
+            # Estimates only describe the whole table
+            return super().count
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [query.model._meta.db_table]
+            )
+            row = cursor.fetchone()
+        estimate = row[0] if row else 0
+        if estimate < self.EXACT_COUNT_THRESHOLD:
+            return super().count
+        return estimate
+
+
 @admin.register(Pokemon)
 class PokemonAdmin(admin.ModelAdmin):
     list_display = ['name', 'pokemon_id', 'height', 'weight', 'base_experience', 'created_at']
@@ -15,7 +47,7 @@ class PokemonAdmin(admin.ModelAdmin):
             'fields': ('name', 'pokemon_id', 'height', 'weight', 'base_experience')
         }),
         ('Raw Data', {
-            'fields': ('raw_data',),
+            'fields': ('raw_data', 'etag'),
             'classes': ('collapse',)
         }),
         ('Timestamps', {
@@ -23,6 +55,16 @@ class PokemonAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         })
     )
+    
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        if not is_changelist(request):
+            # The change form shows every field; deferring would cost a query each
+            return queryset
+        # Skip the raw_data blob; the changelist only shows plain columns
+        return queryset.only(
+            'name', 'pokemon_id', 'height', 'weight', 'base_experience', 'created_at', 'updated_at'
+        )
 
 
 @admin.register(APIRequest)
@@ -31,6 +73,17 @@ class APIRequestAdmin(admin.ModelAdmin):
     list_filter = ['success', 'request_timestamp', 'http_status_code']
     search_fields = ['pokemon_name', 'error_message']
     readonly_fields = ['request_timestamp']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False  # avoids a second COUNT(*) per page
+    
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        if not is_changelist(request):
+            return queryset
+        # Skip the response_data blob; the changelist only shows plain columns
+        return queryset.only(
+            'pokemon_name', 'success', 'http_status_code', 'request_timestamp'
+        )
     
     def has_add_permission(self, request):
         return False  # Don't allow manual creation
@@ -17,11 +17,12 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         service = PokemonAPIService()
         
-        for pokemon_name in options['pokemon_names']:
-            self.stdout.write(f"Fetching {pokemon_name}...")
-            
-            pokemon, success, error = service.fetch_pokemon(pokemon_name)
-            
+        pokemon_names = options['pokemon_names']
+        self.stdout.write(f"Fetching {', '.join(pokemon_names)}...")
+        
+        for pokemon_name, (pokemon, success, error) in service.fetch_many(
+            pokemon_names, force=options['force']
+        ):
             if success:
                 self.stdout.write(
                     self.style.SUCCESS(f"✅ Successfully fetched {pokemon.name}")
@@ -30,5 +31,5 @@ class Command(BaseCommand):
                 self.stdout.write(
                     self.style.ERROR(f"❌ Failed to fetch {pokemon_name}: {error}")
                 )
-
-
+        
+        service.flush_logs()
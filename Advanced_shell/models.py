@@ -1,9 +1,49 @@
 # pokemon_api/models.py
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
+from django.db.models.expressions import RawSQL
+from django.db.models.fields.json import KeyTransform
+from django.db.models.functions import Upper
 from django.utils import timezone
+from functools import cached_property
 import json
 
 
+class PokemonQuerySet(models.QuerySet):
+    def of_type(self, type_name):
+        """Filter by type with a JSONB containment query on raw_data->'types'"""
+        return self.filter(raw_data__types__contains=[{'type': {'name': type_name}}])
+
+    def with_json_projections(self):
+        """
+        Extract types, abilities and base stats with Postgres JSON path
+        expressions instead of loading raw_data into Python.
+        The annotations pre-fill the matching cached properties on each instance.
+        """
+        return self.defer('raw_data').annotate(
+            types=RawSQL(
+                "jsonb_path_query_array(raw_data, '$.types[*].type.name')",
+                [], output_field=models.JSONField()
+            ),
+            abilities=RawSQL(
+                "jsonb_path_query_array(raw_data, '$.abilities[*] ? (@.is_hidden == false).ability.name')",
+                [], output_field=models.JSONField()
+            ),
+            hidden_abilities=RawSQL(
+                "jsonb_path_query_array(raw_data, '$.abilities[*] ? (@.is_hidden == true).ability.name')",
+                [], output_field=models.JSONField()
+            ),
+            # json (not jsonb) keeps the API's stat order; sent as text so
+            # JSONField decodes it like the other annotations
+            base_stats=RawSQL(
+                "COALESCE((SELECT json_object_agg(stat->'stat'->>'name', stat->'base_stat' ORDER BY ord) "
+                "FROM jsonb_array_elements(raw_data->'stats') WITH ORDINALITY AS stats(stat, ord)), "
+                "'{}'::json)::text",
+                [], output_field=models.JSONField()
+            ),
+        )
+
+
 class Pokemon(models.Model):
     """Model to store Pokemon data from the API"""
     pokemon_id = models.IntegerField(unique=True)
@@ -12,15 +52,30 @@ class Pokemon(models.Model):
     weight = models.IntegerField()  # in hectograms
     base_experience = models.IntegerField(null=True, blank=True)
     raw_data = models.JSONField()  # Store complete API response
+    etag = models.CharField(max_length=128, blank=True)  # for conditional refetches
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = PokemonQuerySet.as_manager()
+
     class Meta:
         ordering = ['pokemon_id']
+        indexes = [
+            # Covers only the types array, so it stays far smaller than a
+            # GIN index over the whole raw_data document
+            GinIndex(KeyTransform('types', 'raw_data'), name='pokemon_types_gin'),
+            # Postgres compiles name__iexact to UPPER("name") = UPPER(%s)
+            models.Index(Upper('name'), name='pokemon_name_upper_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} (#{self.pokemon_id})"
 
+    @staticmethod
+    def json_filename(name, pokemon_id):
+        """Storage path of the gzipped API response saved for a Pokemon"""
+        return f"pokemon_data/{name}_{pokemon_id}.json.gz"
+
     @property
     def height_in_meters(self):
         return self.height * 0.1
@@ -29,44 +84,40 @@ class Pokemon(models.Model):
     def weight_in_kg(self):
         return self.weight * 0.1
 
-    @property
+    @cached_property
+    def _parsed_raw_data(self):
+        """Walk raw_data once, collecting types, abilities and base stats"""
+        parsed = {'types': [], 'abilities': [], 'hidden_abilities': [], 'base_stats': {}}
+        if not self.raw_data:
+            return parsed
+        for type_data in self.raw_data.get('types', []):
+            parsed['types'].append(type_data['type']['name'])
+        for ability in self.raw_data.get('abilities', []):
+            key = 'hidden_abilities' if ability['is_hidden'] else 'abilities'
+            parsed[key].append(ability['ability']['name'])
+        for stat in self.raw_data.get('stats', []):
+            parsed['base_stats'][stat['stat']['name']] = stat['base_stat']
+        return parsed
+
+    @cached_property
     def types(self):
         """Extract types from raw_data"""
-        if self.raw_data and 'types' in self.raw_data:
-            return [type_data['type']['name'] for type_data in self.raw_data['types']]
-        return []
+        return self._parsed_raw_data['types']
 
-    @property
+    @cached_property
     def abilities(self):
         """Extract regular abilities from raw_data"""
-        if self.raw_data and 'abilities' in self.raw_data:
-            return [
-                ability['ability']['name'] 
-                for ability in self.raw_data['abilities'] 
-                if not ability['is_hidden']
-            ]
-        return []
+        return self._parsed_raw_data['abilities']
 
-    @property
+    @cached_property
     def hidden_abilities(self):
         """Extract hidden abilities from raw_data"""
-        if self.raw_data and 'abilities' in self.raw_data:
-            return [
-                ability['ability']['name'] 
-                for ability in self.raw_data['abilities'] 
-                if ability['is_hidden']
-            ]
-        return []
+        return self._parsed_raw_data['hidden_abilities']
 
-    @property
+    @cached_property
     def base_stats(self):
         """Extract base stats from raw_data"""
-        if self.raw_data and 'stats' in self.raw_data:
-            return {
-                stat['stat']['name']: stat['base_stat'] 
-                for stat in self.raw_data['stats']
-            }
-        return {}
+        return self._parsed_raw_data['base_stats']
 
 
 class APIRequest(models.Model):
@@ -80,6 +131,11 @@ class APIRequest(models.Model):
 
     class Meta:
         ordering = ['-request_timestamp']
+        indexes = [
+            models.Index(fields=['-request_timestamp'], name='apireq_timestamp_desc_idx'),
+            models.Index(fields=['pokemon_name'], name='apireq_pokemon_name_idx'),
+            models.Index(fields=['success', 'request_timestamp'], name='apireq_success_ts_idx'),
+        ]
 
     def __str__(self):
         status = "SUCCESS" if self.success else "ERROR"
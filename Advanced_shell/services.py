@@ -1,68 +1,132 @@
 # pokemon_api/services.py
+import gzip
+import os
+import uuid
 import requests
-import json
+import orjson
 import logging
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
 from django.conf import settings
 from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
+from django.db import connection
+from django.utils import timezone
 from .models import Pokemon, APIRequest
 
 logger = logging.getLogger(__name__)
 
+# Shared across service instances so keep-alive connections to the API
+# survive between web requests
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    # raise_on_status=False hands the last 5xx response back to fetch_pokemon's
+    # status handling instead of raising RetryError
+    max_retries=Retry(
+        total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504], raise_on_status=False
+    )
+))
+_SESSION.headers.update({
+    'User-Agent': 'Django-Pokemon-App/1.0'
+})
+
 
 class PokemonAPIService:
     """Service class to handle Pokemon API interactions"""
     
     BASE_URL = "https://pokeapi.co/api/v2/pokemon/"
     TIMEOUT = 30
+    MAX_WORKERS = 16
+    CACHE_TTL = timedelta(days=7)  # reuse stored Pokemon younger than this
     
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Django-Pokemon-App/1.0'
-        })
+        self.session = _SESSION
+        # Prepared once; each fetch copies it and swaps in the Pokemon's URL,
+        # skipping the header merge and hooks session.get() runs per call
+        self._request_template = requests.Request(
+            'GET', self.BASE_URL, headers={**self.session.headers, 'Accept': 'application/json'}
+        ).prepare()
+        self.log_buffer = []  # unsaved APIRequest rows awaiting flush_logs()
+        self._buffer_logs = False
     
-    def fetch_pokemon(self, pokemon_name):
+    def fetch_pokemon(self, pokemon_name, force=False):
         """
         Fetch Pokemon data from API and save to database
+        Stored Pokemon newer than CACHE_TTL are returned as-is unless force is set;
+        older ones are revalidated with their ETag
+        Returns: (Pokemon instance or None, success boolean, error message)
+        """
+        pokemon_name = pokemon_name.lower().strip()
+        
+        existing = Pokemon.objects.filter(name__iexact=pokemon_name).first()
+        if existing and not force and self.is_fresh(existing):
+            logger.info(f"Using stored Pokemon data for: {pokemon_name}")
+            return existing, True, None
+        
+        return self.refetch_pokemon(pokemon_name, existing)
+    
+    def is_fresh(self, pokemon):
+        """True if a stored Pokemon is recent enough to skip the API"""
+        return timezone.now() - pokemon.updated_at < self.CACHE_TTL
+    
+    def refetch_pokemon(self, pokemon_name, existing=None):
+        """
+        Fetch Pokemon data from API without the stored-data check, revalidating
+        the already loaded existing row with its ETag when given
         Returns: (Pokemon instance or None, success boolean, error message)
         """
         pokemon_name = pokemon_name.lower().strip()
-        url = f"{self.BASE_URL}{pokemon_name}/"
+        
+        request = self._request_template.copy()
+        request.prepare_url(f"{self.BASE_URL}{pokemon_name}/", None)
+        if existing and existing.etag:
+            request.headers['If-None-Match'] = existing.etag
+        
+        # Collected while fetching and logged as a single APIRequest row
+        status_code = None
+        error_msg = None
         
         try:
             logger.info(f"Fetching Pokemon data for: {pokemon_name}")
-            response = self.session.get(url, timeout=self.TIMEOUT)
+            response = self.session.send(request, timeout=self.TIMEOUT)
+            status_code = response.status_code
             
-            # Log the API request
-            api_request = APIRequest.objects.create(
-                pokemon_name=pokemon_name,
-                success=response.status_code == 200,
-                http_status_code=response.status_code,
-                error_message="" if response.status_code == 200 else f"HTTP {response.status_code}",
-                response_data=response.json() if response.status_code == 200 else None
-            )
+            if response.status_code == 304:
+                # Stored data is still current; just restart its freshness window
+                Pokemon.objects.filter(pk=existing.pk).update(updated_at=timezone.now())
+                logger.info(f"Pokemon data not modified: {existing.name}")
+                return existing, True, None
             
-            if response.status_code == 200:
-                data = response.json()
+            elif response.status_code == 200:
+                data = orjson.loads(response.content)
                 
                 # Save JSON data to file
-                self._save_json_to_file(data, pokemon_name)
+                self._save_json_to_file(data)
                 
-                # Create or update Pokemon in database
-                pokemon, created = Pokemon.objects.update_or_create(
-                    pokemon_id=data['id'],
-                    defaults={
-                        'name': data['name'],
-                        'height': data['height'],
-                        'weight': data['weight'],
-                        'base_experience': data.get('base_experience'),
-                        'raw_data': data
-                    }
+                # Create or update Pokemon in a single INSERT ... ON CONFLICT
+                pokemon, = Pokemon.objects.bulk_create(
+                    [Pokemon(
+                        pokemon_id=data['id'],
+                        name=data['name'],
+                        height=data['height'],
+                        weight=data['weight'],
+                        base_experience=data.get('base_experience'),
+                        raw_data=data,
+                        etag=response.headers.get('ETag', '')
+                    )],
+                    update_conflicts=True,
+                    unique_fields=['pokemon_id'],
+                    update_fields=['name', 'height', 'weight', 'base_experience', 'raw_data', 'etag', 'updated_at']
                 )
+                if pokemon.pk is None:
+                    # Backends that can't return the upserted primary key
+                    pokemon = Pokemon.objects.get(pokemon_id=data['id'])
                 
-                action = "Created" if created else "Updated"
-                logger.info(f"{action} Pokemon: {pokemon.name}")
+                logger.info(f"Saved Pokemon: {pokemon.name}")
                 
                 return pokemon, True, None
                 
@@ -79,38 +143,83 @@ class PokemonAPIService:
         except requests.exceptions.Timeout:
             error_msg = f"Request timeout for Pokemon: {pokemon_name}"
             logger.error(error_msg)
-            self._log_error(pokemon_name, error_msg)
             return None, False, error_msg
             
         except requests.exceptions.ConnectionError:
             error_msg = f"Connection error when fetching Pokemon: {pokemon_name}"
             logger.error(error_msg)
-            self._log_error(pokemon_name, error_msg)
             return None, False, error_msg
             
         except Exception as e:
             error_msg = f"Unexpected error: {str(e)}"
             logger.error(error_msg)
-            self._log_error(pokemon_name, error_msg)
             return None, False, error_msg
+        
+        finally:
+            # Log the API request; the payload already lives in Pokemon.raw_data
+            self.log_buffer.append(APIRequest(
+                pokemon_name=pokemon_name,
+                success=error_msg is None,
+                http_status_code=status_code,
+                error_message=error_msg or "",
+                response_data=None
+            ))
+            if not self._buffer_logs:
+                self.flush_logs()
     
-    def _save_json_to_file(self, data, pokemon_name):
-        """Save JSON data to media/pokemon_data/ directory"""
+    def fetch_many(self, pokemon_names, force=False):
+        """
+        Fetch several Pokemon concurrently, sharing this service's session
+        Yields: (pokemon name, (Pokemon instance or None, success boolean, error message))
+        in completion order
+        """
+        self._buffer_logs = True
         try:
-            filename = f"pokemon_data/{pokemon_name}_{data['id']}.json"
-            json_content = json.dumps(data, indent=2)
+            with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as executor:
+                futures = {
+                    executor.submit(self._fetch_in_thread, pokemon_name, force): pokemon_name
+                    for pokemon_name in pokemon_names
+                }
+                for future in as_completed(futures):
+                    yield futures[future], future.result()
+        finally:
+            self._buffer_logs = False
+            self.flush_logs()
+    
+    def flush_logs(self):
+        """Write buffered APIRequest rows to the database in bulk"""
+        if self.log_buffer:
+            APIRequest.objects.bulk_create(self.log_buffer, batch_size=1000)
+            self.log_buffer.clear()
+    
+    def _fetch_in_thread(self, pokemon_name, force):
+        """Run fetch_pokemon in a worker thread and release its DB connection"""
+        try:
+            return self.fetch_pokemon(pokemon_name, force=force)
+        finally:
+            connection.close()
+    
+    def _save_json_to_file(self, data):
+        """Save gzipped JSON data to media/pokemon_data/ directory"""
+        try:
+            # Named by the API's own name so lookups by id or alias share one file
+            filename = Pokemon.json_filename(data['name'], data['id'])
             
-            # Save using Django's file storage system
-            default_storage.save(filename, ContentFile(json_content))
+            # orjson yields bytes directly, so no intermediate str is built;
+            # compressing once here lets downloads be served without gzipping
+            json_content = gzip.compress(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            
+            # Only called for 200 responses, which carry new data (a 304 answers
+            # an unchanged ETag), so replace any existing file. Write a temporary
+            # file and rename it over the target so readers never see it missing
+            # and concurrent fetches can't leave suffixed duplicates behind
+            temp_name = default_storage.save(f"{filename}.{uuid.uuid4().hex}.tmp", ContentFile(json_content))
+            try:
+                os.replace(default_storage.path(temp_name), default_storage.path(filename))
+            except Exception:
+                default_storage.delete(temp_name)
+                raise
             logger.info(f"Saved JSON data to {filename}")
             
         except Exception as e:
             logger.error(f"Failed to save JSON file: {str(e)}")
-    
-    def _log_error(self, pokemon_name, error_message):
-        """Log error to database"""
-        APIRequest.objects.create(
-            pokemon_name=pokemon_name,
-            success=False,
-            error_message=error_message
-        )
@@ -31,6 +31,35 @@ if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
 """
 
+# Compress responses (the JSON API and downloads compress well):
+"""
+MIDDLEWARE = [
+    'django.middleware.gzip.GZipMiddleware',  # Add this line first
+    'django.middleware.security.SecurityMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+"""
+
+# Database configuration (PostgreSQL is required: the app uses JSONB
+# path queries, GIN indexes and pg_class row estimates):
+"""
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': 'pokemon',
+        'USER': 'pokemon',
+        'PASSWORD': '',
+        'HOST': 'localhost',
+        'PORT': '5432',
+    }
+}
+"""
+
 # Media files configuration for JSON storage
 """
 # Add to settings.py
@@ -69,6 +98,8 @@ LOGGING = {
 """
 Django>=4.2.0
 requests>=2.28.0
+orjson>=3.8.0
+psycopg[binary]>=3.1
 Pillow>=9.0.0
 """
 
@@ -122,14 +153,119 @@ class Migration(migrations.Migration):
     ]
 """
 
+# ===================================================================
+# pokemon_api/migrations/0002_apirequest_indexes.py
+"""
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pokemon_api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='apirequest',
+            index=models.Index(fields=['-request_timestamp'], name='apireq_timestamp_desc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='apirequest',
+            index=models.Index(fields=['pokemon_name'], name='apireq_pokemon_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='apirequest',
+            index=models.Index(fields=['success', 'request_timestamp'], name='apireq_success_ts_idx'),
+        ),
+    ]
+"""
+
+# ===================================================================
+# pokemon_api/migrations/0003_pokemon_types_gin.py
+"""
+import django.contrib.postgres.indexes
+import django.db.models.fields.json
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pokemon_api', '0002_apirequest_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='pokemon',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.db.models.fields.json.KeyTransform('types', 'raw_data'),
+                name='pokemon_types_gin',
+            ),
+        ),
+    ]
+"""
+
+# ===================================================================
+# pokemon_api/migrations/0004_pokemon_name_upper_idx.py
+"""
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pokemon_api', '0003_pokemon_types_gin'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='pokemon',
+            index=models.Index(
+                django.db.models.functions.text.Upper('name'),
+                name='pokemon_name_upper_idx',
+            ),
+        ),
+    ]
+"""
+
+# ===================================================================
+# pokemon_api/migrations/0005_pokemon_etag.py
+"""
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pokemon_api', '0004_pokemon_name_upper_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pokemon',
+            name='etag',
+            field=models.CharField(blank=True, max_length=128),
+        ),
+    ]
+"""
+
 # ===================================================================
 # pokemon_api/tests.py
-from django.test import TestCase, Client
+from django.db import connection
+from django.core.files.storage import default_storage
+from django.test import TestCase, TransactionTestCase, Client, override_settings
+from django.utils import timezone
 from django.urls import reverse
 from unittest.mock import patch, MagicMock
 from .models import Pokemon, APIRequest
 from .services import PokemonAPIService
+import gzip
 import json
+from datetime import timedelta
+import shutil
+import tempfile
 
 
 class PokemonModelTest(TestCase):
@@ -184,18 +320,54 @@ class PokemonModelTest(TestCase):
     def test_base_stats_property(self):
         expected_stats = {"hp": 35, "attack": 55}
         self.assertEqual(self.pokemon.base_stats, expected_stats)
+        
+    def test_json_projections_match_python_properties(self):
+        Pokemon.objects.create(
+            pokemon_id=6,
+            name="charizard",
+            height=17,
+            weight=905,
+            base_experience=267,
+            raw_data={
+                "id": 6,
+                "name": "charizard",
+                "types": [{"type": {"name": "fire"}}, {"type": {"name": "flying"}}],
+                "abilities": [
+                    {"ability": {"name": "blaze"}, "is_hidden": False},
+                    {"ability": {"name": "solar-power"}, "is_hidden": True}
+                ],
+                "stats": [
+                    {"stat": {"name": "hp"}, "base_stat": 78},
+                    {"stat": {"name": "attack"}, "base_stat": 84},
+                    {"stat": {"name": "defense"}, "base_stat": 78},
+                    {"stat": {"name": "special-attack"}, "base_stat": 109},
+                    {"stat": {"name": "special-defense"}, "base_stat": 85},
+                    {"stat": {"name": "speed"}, "base_stat": 100}
+                ]
+            }
+        )
+        
+        parsed = Pokemon.objects.get(name="charizard")
+        projected = Pokemon.objects.with_json_projections().get(name="charizard")
+        
+        self.assertEqual(projected.types, parsed.types)
+        self.assertEqual(projected.abilities, parsed.abilities)
+        self.assertEqual(projected.hidden_abilities, ["solar-power"])
+        self.assertEqual(projected.hidden_abilities, parsed.hidden_abilities)
+        # Key order matters: it is what the JSON API emits
+        self.assertEqual(list(projected.base_stats.items()), list(parsed.base_stats.items()))
 
 
 class PokemonAPIServiceTest(TestCase):
     def setUp(self):
         self.service = PokemonAPIService()
         
-    @patch('pokemon_api.services.requests.Session.get')
-    def test_successful_fetch(self, mock_get):
+    @patch('pokemon_api.services.requests.Session.send')
+    def test_successful_fetch(self, mock_send):
         # Mock successful API response
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {
+        mock_response.content = json.dumps({
             "id": 1,
             "name": "bulbasaur",
             "height": 7,
@@ -204,8 +376,9 @@ class PokemonAPIServiceTest(TestCase):
             "types": [{"type": {"name": "grass"}}],
             "abilities": [{"ability": {"name": "overgrow"}, "is_hidden": False}],
             "stats": [{"stat": {"name": "hp"}, "base_stat": 45}]
-        }
-        mock_get.return_value = mock_response
+        }).encode()
+        mock_response.headers = {"ETag": '"bulbasaur-v1"'}
+        mock_send.return_value = mock_response
         
         pokemon, success, error = self.service.fetch_pokemon("bulbasaur")
         
@@ -213,19 +386,89 @@ class PokemonAPIServiceTest(TestCase):
         self.assertIsNone(error)
         self.assertEqual(pokemon.name, "bulbasaur")
         self.assertEqual(pokemon.pokemon_id, 1)
+        self.assertEqual(pokemon.etag, '"bulbasaur-v1"')
+        
+    @patch('pokemon_api.services.requests.Session.send')
+    def test_not_modified_returns_stored_pokemon(self, mock_send):
+        stored = Pokemon.objects.create(
+            pokemon_id=1,
+            name="bulbasaur",
+            height=7,
+            weight=69,
+            raw_data={"id": 1, "name": "bulbasaur"},
+            etag='"bulbasaur-v1"'
+        )
+        mock_response = MagicMock()
+        mock_response.status_code = 304
+        mock_send.return_value = mock_response
         
-    @patch('pokemon_api.services.requests.Session.get')
-    def test_pokemon_not_found(self, mock_get):
+        pokemon, success, error = self.service.fetch_pokemon("bulbasaur", force=True)
+        
+        self.assertTrue(success)
+        self.assertEqual(pokemon.pk, stored.pk)
+        sent_request = mock_send.call_args.args[0]
+        self.assertEqual(sent_request.url, "https://pokeapi.co/api/v2/pokemon/bulbasaur/")
+        self.assertEqual(sent_request.headers['If-None-Match'], '"bulbasaur-v1"')
+        
+    @patch('pokemon_api.services.requests.Session.send')
+    def test_pokemon_not_found(self, mock_send):
         # Mock 404 response
         mock_response = MagicMock()
         mock_response.status_code = 404
-        mock_get.return_value = mock_response
+        mock_send.return_value = mock_response
         
         pokemon, success, error = self.service.fetch_pokemon("nonexistent")
         
         self.assertFalse(success)
         self.assertIsNone(pokemon)
         self.assertIn("not found", error)
+        self.assertEqual(APIRequest.objects.filter(pokemon_name="nonexistent").count(), 1)
+
+
+class PokemonFetchManyTest(TransactionTestCase):
+    # Worker threads use their own DB connections, so they can't see data
+    # inside a TestCase transaction
+    names = ["missingno", "bulbasaur", "charmander", "squirtle"]
+    
+    def setUp(self):
+        self.service = PokemonAPIService()
+        send_patcher = patch('pokemon_api.services.requests.Session.send')
+        self.mock_send = send_patcher.start()
+        self.addCleanup(send_patcher.stop)
+        mock_response = MagicMock()
+        mock_response.status_code = 404
+        self.mock_send.return_value = mock_response
+        
+    def test_fetch_many_yields_every_name(self):
+        results = dict(self.service.fetch_many(self.names))
+        
+        self.assertEqual(sorted(results), sorted(self.names))
+        for pokemon, success, error in results.values():
+            self.assertIsNone(pokemon)
+            self.assertFalse(success)
+            self.assertIn("not found", error)
+        self.assertEqual(self.mock_send.call_count, len(self.names))
+        
+    def test_fetch_many_closes_worker_connections(self):
+        # Wrapping the proxy still closes each worker thread's real connection
+        mock_connection = MagicMock(wraps=connection)
+        
+        with patch('pokemon_api.services.connection', mock_connection):
+            list(self.service.fetch_many(self.names))
+        
+        self.assertEqual(mock_connection.close.call_count, len(self.names))
+        
+    def test_fetch_many_flushes_logs_after_finishing(self):
+        for pokemon_name, result in self.service.fetch_many(self.names):
+            # Rows are buffered until the generator is exhausted
+            self.assertEqual(APIRequest.objects.count(), 0)
+        
+        self.assertEqual(APIRequest.objects.count(), self.mock_send.call_count)
+        self.assertEqual(
+            sorted(APIRequest.objects.values_list('pokemon_name', flat=True)),
+            sorted(self.names)
+        )
+        self.assertEqual(self.service.log_buffer, [])
 
 
 class PokemonViewsTest(TestCase):
@@ -260,6 +503,139 @@ class PokemonViewsTest(TestCase):
         data = json.loads(response.content)
         self.assertTrue(data['success'])
         self.assertEqual(data['data']['name'], 'pikachu')
+        
+    @patch('pokemon_api.services.requests.Session.send')
+    def test_pokemon_api_endpoint_force_zero_uses_stored_data(self, mock_send):
+        url = reverse('pokemon_api:api', kwargs={'pokemon_name': 'pikachu'})
+        for value in ('0', 'false'):
+            response = self.client.get(url, {'force': value})
+            self.assertEqual(response.status_code, 200)
+        mock_send.assert_not_called()
+        
+    @patch('pokemon_api.services.requests.Session.send')
+    def test_pokemon_api_endpoint_revalidates_stale_data(self, mock_send):
+        Pokemon.objects.filter(pk=self.pokemon.pk).update(
+            etag='"pikachu-v1"',
+            updated_at=timezone.now() - PokemonAPIService.CACHE_TTL - timedelta(minutes=1)
+        )
+        mock_response = MagicMock()
+        mock_response.status_code = 304
+        mock_send.return_value = mock_response
+        
+        response = self.client.get(reverse('pokemon_api:api', kwargs={'pokemon_name': 'pikachu'}))
+        
+        self.assertEqual(response.status_code, 200)
+        mock_send.assert_called_once()
+        self.assertEqual(mock_send.call_args.args[0].headers['If-None-Match'], '"pikachu-v1"')
+        
+    def test_pokemon_api_endpoint_basic_fields(self):
+        url = reverse('pokemon_api:api', kwargs={'pokemon_name': 'pikachu'})
+        
+        # A single SELECT: raw_data is deferred and never loaded
+        with self.assertNumQueries(1):
+            response = self.client.get(url, {'fields': 'basic'})
+        
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)['data']
+        self.assertEqual(set(data), {
+            'id', 'name', 'height', 'weight', 'height_meters', 'weight_kg', 'base_experience'
+        })
+
+
+class DownloadJSONViewTest(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media_override = override_settings(MEDIA_ROOT=media_root)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+        
+        self.raw_data = {"id": 25, "name": "pikachu", "base_experience": 112}
+        self.pokemon = Pokemon.objects.create(
+            pokemon_id=25,
+            name="pikachu",
+            height=4,
+            weight=60,
+            base_experience=112,
+            raw_data=self.raw_data
+        )
+        self.url = reverse('pokemon_api:download', kwargs={'pk': self.pokemon.pk})
+    
+    def test_download_serves_stored_gzip_file(self):
+        PokemonAPIService()._save_json_to_file(self.raw_data)
+        
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('attachment', response['Content-Disposition'])
+        body = gzip.decompress(b"".join(response.streaming_content))
+        self.assertEqual(json.loads(body), self.raw_data)
+    
+    def test_download_without_gzip_serves_plain_json(self):
+        PokemonAPIService()._save_json_to_file(self.raw_data)
+        
+        # The stored file is decompressed; raw_data is never loaded
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+            body = b"".join(response.streaming_content)
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(
+            response['Content-Disposition'], 'attachment; filename="pikachu_data.json"'
+        )
+        self.assertEqual(json.loads(body), self.raw_data)
+    
+    def test_download_without_stored_file_serializes_raw_data(self):
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='identity')
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(
+            response['Content-Disposition'], 'attachment; filename="pikachu_data.json"'
+        )
+        self.assertEqual(json.loads(response.content), self.raw_data)
+    
+    @patch('pokemon_api.services.requests.Session.send')
+    def test_refetch_replaces_stored_file(self, mock_send):
+        PokemonAPIService()._save_json_to_file(self.raw_data)
+        updated_data = {**self.raw_data, "height": 4, "weight": 60, "base_experience": 999}
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.content = json.dumps(updated_data).encode()
+        mock_response.headers = {"ETag": '"v2"'}
+        mock_send.return_value = mock_response
+        
+        pokemon, success, error = PokemonAPIService().fetch_pokemon("pikachu", force=True)
+        
+        self.assertTrue(success)
+        self.assertEqual(default_storage.listdir("pokemon_data")[1], ["pikachu_25.json.gz"])
+        gzip_response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        plain_response = self.client.get(self.url)
+        gzip_body = gzip.decompress(b"".join(gzip_response.streaming_content))
+        self.assertEqual(json.loads(gzip_body)["base_experience"], 999)
+        plain_body = b"".join(plain_response.streaming_content)
+        self.assertEqual(json.loads(plain_body)["base_experience"], 999)
+    
+    @patch('pokemon_api.services.requests.Session.send')
+    def test_fetch_by_id_replaces_file_named_after_pokemon(self, mock_send):
+        PokemonAPIService()._save_json_to_file(self.raw_data)
+        updated_data = {**self.raw_data, "height": 4, "weight": 60, "base_experience": 999}
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.content = json.dumps(updated_data).encode()
+        mock_response.headers = {"ETag": '"v2"'}
+        mock_send.return_value = mock_response
+        
+        pokemon, success, error = PokemonAPIService().fetch_pokemon("25", force=True)
+        
+        self.assertTrue(success)
+        self.assertEqual(default_storage.listdir("pokemon_data")[1], ["pikachu_25.json.gz"])
+        gzip_response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        gzip_body = gzip.decompress(b"".join(gzip_response.streaming_content))
+        self.assertEqual(json.loads(gzip_body)["base_experience"], 999)
 
 
 # ===================================================================
@@ -278,6 +654,8 @@ Django Pokemon API Project Setup Guide
 =====================================
 
 1. Installation & Setup:
+   - Requires PostgreSQL: point DATABASES at a PostgreSQL database (see above);
+     migrations and the JSON API use PostgreSQL-only JSONB features
    - Add 'pokemon_api' to INSTALLED_APPS
    - Include URLs in main project
    - Run migrations: python manage.py makemigrations && python manage.py migrate
@@ -293,6 +671,7 @@ Django Pokemon API Project Setup Guide
    from pokemon_api.services import PokemonAPIService
    service = PokemonAPIService()
    pokemon, success, error = service.fetch_pokemon("pikachu")
+   fire_pokemon = Pokemon.objects.of_type("fire")  # uses the types GIN index
    
    # API endpoints:
    GET /pokemon/api/pokemon/pikachu/  # JSON API
@@ -326,7 +705,11 @@ Django Pokemon API Project Setup Guide
    │       └── fetch_pokemon.py
    └── migrations/
        ├── __init__.py
-       └── 0001_initial.py
+       ├── 0001_initial.py
+       ├── 0002_apirequest_indexes.py
+       ├── 0003_pokemon_types_gin.py
+       ├── 0004_pokemon_name_upper_idx.py
+       └── 0005_pokemon_etag.py
 
    templates/pokemon_api/
    ├── base.html
@@ -1,7 +1,11 @@
 # pokemon_api/views.py
 from django.shortcuts import render, get_object_or_404
-from django.http import JsonResponse, HttpResponse
+from django.http import HttpResponse, FileResponse
+from django.core.files.storage import default_storage
+from django.utils.cache import patch_vary_headers
+from django.utils.decorators import method_decorator
 from django.views import View
+from django.views.decorators.gzip import gzip_page
 from django.views.generic import ListView, DetailView
 from django.contrib import messages
 from django.urls import reverse_lazy
@@ -9,7 +13,37 @@ from django.views.generic.edit import FormView
 from django import forms
 from .models import Pokemon, APIRequest
 from .services import PokemonAPIService
-import json
+import gzip
+import orjson
+
+
+def json_response(payload, status=200):
+    """Serialize payload with orjson into an application/json response"""
+    return HttpResponse(orjson.dumps(payload), content_type='application/json', status=status)
+
+
+def pokemon_to_basic_dict(pokemon):
+    """Serialize only the Pokemon's own columns, leaving raw_data untouched"""
+    return {
+        'id': pokemon.pokemon_id,
+        'name': pokemon.name,
+        'height': pokemon.height,
+        'weight': pokemon.weight,
+        'height_meters': pokemon.height_in_meters,
+        'weight_kg': pokemon.weight_in_kg,
+        'base_experience': pokemon.base_experience,
+    }
+
+
+def pokemon_to_dict(pokemon):
+    """Serialize a Pokemon for the JSON API"""
+    return {
+        **pokemon_to_basic_dict(pokemon),
+        'types': pokemon.types,
+        'abilities': pokemon.abilities,
+        'hidden_abilities': pokemon.hidden_abilities,
+        'base_stats': pokemon.base_stats,
+    }
 
 
 class PokemonSearchForm(forms.Form):
@@ -29,6 +63,10 @@ class PokemonListView(ListView):
     template_name = 'pokemon_api/pokemon_list.html'
     context_object_name = 'pokemons'
     paginate_by = 20
+    
+    def get_queryset(self):
+        # The list only shows plain columns; skip loading the raw_data blob
+        return Pokemon.objects.defer('raw_data').order_by('pokemon_id')
 
 
 class PokemonDetailView(DetailView):
@@ -64,72 +102,83 @@ class PokemonSearchView(FormView):
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['recent_requests'] = APIRequest.objects.all()[:10]
+        context['recent_requests'] = APIRequest.objects.only(
+            'pokemon_name', 'success', 'http_status_code', 'request_timestamp'
+        ).order_by('-request_timestamp')[:10]
         return context
 
 
+@method_decorator(gzip_page, name='dispatch')
 class PokemonAPIView(View):
     """API endpoint to fetch Pokemon data"""
     
     def get(self, request, pokemon_name):
         """Get Pokemon data (from database or fetch from API)"""
-        try:
-            # First try to get from database
-            pokemon = Pokemon.objects.get(name=pokemon_name.lower())
-            return JsonResponse({
-                'success': True,
-                'data': {
-                    'id': pokemon.pokemon_id,
-                    'name': pokemon.name,
-                    'height': pokemon.height,
-                    'weight': pokemon.weight,
-                    'height_meters': pokemon.height_in_meters,
-                    'weight_kg': pokemon.weight_in_kg,
-                    'base_experience': pokemon.base_experience,
-                    'types': pokemon.types,
-                    'abilities': pokemon.abilities,
-                    'hidden_abilities': pokemon.hidden_abilities,
-                    'base_stats': pokemon.base_stats,
-                }
-            })
-        except Pokemon.DoesNotExist:
-            # If not in database, fetch from API
-            service = PokemonAPIService()
-            pokemon, success, error = service.fetch_pokemon(pokemon_name)
-            
-            if success:
-                return JsonResponse({
+        force = request.GET.get('force') in ('1', 'true')
+        basic = request.GET.get('fields') == 'basic'
+        service = PokemonAPIService()
+        
+        if force:
+            pokemon, success, error = service.fetch_pokemon(pokemon_name, force=True)
+        else:
+            # Serve a fresh stored row without shipping raw_data to Python:
+            # ?fields=basic skips it entirely, otherwise Postgres projects the
+            # JSON-derived fields
+            if basic:
+                queryset = Pokemon.objects.defer('raw_data')
+            else:
+                queryset = Pokemon.objects.with_json_projections()
+            pokemon = queryset.filter(name__iexact=pokemon_name.strip()).first()
+            if pokemon and service.is_fresh(pokemon):
+                return json_response({
                     'success': True,
-                    'data': {
-                        'id': pokemon.pokemon_id,
-                        'name': pokemon.name,
-                        'height': pokemon.height,
-                        'weight': pokemon.weight,
-                        'height_meters': pokemon.height_in_meters,
-                        'weight_kg': pokemon.weight_in_kg,
-                        'base_experience': pokemon.base_experience,
-                        'types': pokemon.types,
-                        'abilities': pokemon.abilities,
-                        'hidden_abilities': pokemon.hidden_abilities,
-                        'base_stats': pokemon.base_stats,
-                    }
+                    'data': pokemon_to_basic_dict(pokemon) if basic else pokemon_to_dict(pokemon)
                 })
-            else:
-                return JsonResponse({
-                    'success': False,
-                    'error': error
-                }, status=404 if 'not found' in error else 500)
+            # Missing or stale: revalidate the row just loaded instead of
+            # having the service look it up again
+            pokemon, success, error = service.refetch_pokemon(pokemon_name, existing=pokemon)
+        
+        if success:
+            return json_response({
+                'success': True,
+                'data': pokemon_to_basic_dict(pokemon) if basic else pokemon_to_dict(pokemon)
+            })
+        else:
+            return json_response({
+                'success': False,
+                'error': error
+            }, status=404 if 'not found' in error else 500)
 
 
+@method_decorator(gzip_page, name='dispatch')
 class DownloadJSONView(View):
     """Download Pokemon data as JSON file"""
     
     def get(self, request, pk):
-        pokemon = get_object_or_404(Pokemon, pk=pk)
+        pokemon = get_object_or_404(Pokemon.objects.only('pokemon_id', 'name'), pk=pk)
+        download_name = f"{pokemon.name}_data.json"
+        
+        # Stream the gzipped copy saved by PokemonAPIService instead of
+        # re-serializing: as-is when the client accepts gzip, else decompressed
+        filename = Pokemon.json_filename(pokemon.name, pokemon.pokemon_id)
+        if default_storage.exists(filename):
+            stored_file = default_storage.open(filename, 'rb')
+            accepts_gzip = 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', '')
+            response = FileResponse(
+                stored_file if accepts_gzip else gzip.open(stored_file),
+                as_attachment=True,
+                filename=download_name,
+                content_type='application/json'
+            )
+            if accepts_gzip:
+                response['Content-Encoding'] = 'gzip'
+            patch_vary_headers(response, ('Accept-Encoding',))
+            return response
         
+        # No stored file (e.g. it failed to save): serialize raw_data instead
         response = HttpResponse(
-            json.dumps(pokemon.raw_data, indent=2),
+            orjson.dumps(pokemon.raw_data, option=orjson.OPT_INDENT_2),
             content_type='application/json'
         )
-        response['Content-Disposition'] = f'attachment; filename="{pokemon.name}_data.json"'
+        response['Content-Disposition'] = f'attachment; filename="{download_name}"'
         return response